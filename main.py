@@ -1,52 +1,61 @@
 import json
+import os
+from functools import lru_cache
 
-from nltk import word_tokenize, pos_tag, ne_chunk, sent_tokenize
+import spacy
 
-from scripts import data_loader as dl
-from scripts import preprocess as pp
+from scripts import build_token_cache as tc
 from models import ner_crf
 
+# Install the model with: python -m spacy download en_core_web_sm
+SPACY_MODEL = "en_core_web_sm"
 
-def process_ner(file_path):
-    with open(file_path, 'r') as file:
-        raw_text = file.read()
-    print("raw text")
-    article = json.loads(raw_text)
-    # 1. Split text into sentences
-    sentences = sent_tokenize(article['text'])
-    for sentence in sentences:
-        # 2. Tokenize and POS tag each sentence
-        tokens = word_tokenize(sentence)
-        tagged_tokens = pos_tag(tokens)
-        # 3. Apply NER chunker
-        # Use binary=True if you only want to find entities without classifying them
-        ner_tree = ne_chunk(tagged_tokens, binary=False)
-        print(f"NER_TREE: {ner_tree!r}")
-        # 4. Extract entities from the resulting tree
-        for chunk in ner_tree:
-            print(chunk)
-            if hasattr(chunk, 'label'):
-                entity_name = ' '.join(c[0] for c in chunk)
-                entity_type = chunk.label()
-                print(f"Entity: {entity_name} | Type: {entity_type}")
-        input("press any key for next sentence>")
-
-### some misc usage examples...
-# example usage:
-process_ner('cnn-lite-articles/fe08f9e4225bf227332a4302f0c4648664702080845e2dd543e07cf359a9448b.json')
-
-# iterate over the articles and generate the crf features for each word
-X = []
-for article in dl.iter_articles():
-    tokens = pp.article_to_sent_tokens_pos(article)
-    n = len(tokens)
-    for i in range(n):
-        X.append([ner_crf.word2features(tokens[i], j) for j in range(len(tokens[i]))])
-
-# now length is 3233 so we want that many labels
-len(X)
-
-
-
-#crf_ner_model = ner_crf.CRFNER()
-#crf_ner_model.fit(X_train=X, y_train=y)
+
+@lru_cache(maxsize=None)
+def _get_nlp():
+    """Load the pipeline once, on first use, so importing this module needs no model.
+
+    process_ner only reads doc.ents, so run just the ner component (it has its
+    own embedding layer, independent of tok2vec/tagger/parser).
+    """
+    return spacy.load(SPACY_MODEL, enable=["ner"])
+
+
+def process_ner(file_paths, batch_size=64, n_process=None):
+    """Yield (entity_text, entity_label) for every entity in the given articles.
+
+    All article texts are streamed through a single batched nlp.pipe pass
+    instead of tokenizing/tagging/chunking each sentence separately.
+    """
+    texts = []
+    for file_path in file_paths:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            texts.append(json.load(file)['text'])
+    n_process = n_process or os.cpu_count() or 1
+    for doc in _get_nlp().pipe(texts, batch_size=batch_size, n_process=n_process):
+        for ent in doc.ents:
+            yield (ent.text, ent.label_)
+
+
+if __name__ == "__main__":
+    ### some misc usage examples...
+    # example usage:
+    for entity_name, entity_type in process_ner(['cnn-lite-articles/fe08f9e4225bf227332a4302f0c4648664702080845e2dd543e07cf359a9448b.json']):
+        print(f"Entity: {entity_name} | Type: {entity_type}")
+
+    # generate the crf features for each word from the cached (token, pos) sentences;
+    # tokenizing/tagging all articles only happens when the cache is missing or older
+    # than the article directory (the daily scraper adds articles)
+    # the token streams depend on the preprocess backend, so labels must use the same one
+    backend = "nltk"
+    if not tc.cache_is_current(tc.TOKEN_CACHE, backend=backend):
+        tc.build_token_cache(tc.TOKEN_CACHE, backend=backend)
+    X = [ner_crf.sent_to_features(sent) for sent in tc.iter_cached_sentences(tc.TOKEN_CACHE, backend)]
+
+    # now length is 3233 so we want that many labels
+    len(X)
+
+
+
+    #crf_ner_model = ner_crf.CRFNER()
+    #crf_ner_model.fit(X_train=X, y_train=y)
@@ -6,13 +6,51 @@ This version expects sentences as lists of (token, pos) tuples, e.g.:
 
 It includes features that use the POS tag as well as token forms.
 """
+import sys
 from typing import List, Tuple
+import pycrfsuite
 import sklearn_crfsuite
 
 
 TokenPos = Tuple[str, str]  # (token, pos)
 SentTP = List[TokenPos]
 
+# Feature names are interned once so every feature dict shares the same key objects.
+(
+    BIAS,
+    TOKEN_LOWER,
+    TOKEN_SUF3,
+    TOKEN_SUF2,
+    TOKEN_ISUPPER,
+    TOKEN_ISTITLE,
+    TOKEN_ISDIGIT,
+    POS,
+    PREV_TOKEN_LOWER,
+    PREV_POS,
+    NEXT_TOKEN_LOWER,
+    NEXT_POS,
+    BOS,
+    EOS,
+) = map(
+    sys.intern,
+    [
+        "bias",
+        "token.lower()",
+        "token[-3:]",
+        "token[-2:]",
+        "token.isupper()",
+        "token.istitle()",
+        "token.isdigit()",
+        "pos",
+        "-1:token.lower()",
+        "-1:pos",
+        "+1:token.lower()",
+        "+1:pos",
+        "BOS",
+        "EOS",
+    ],
+)
+
 
 def word2features(sent: SentTP, i: int) -> dict:
     """
@@ -21,37 +59,71 @@ def word2features(sent: SentTP, i: int) -> dict:
     """
     token, pos = sent[i]
     features = {
-        "bias": 1.0,
-        "token.lower()": token.lower(),
-        "token[-3:]": token[-3:],
-        "token[-2:]": token[-2:],
-        "token.isupper()": token.isupper(),
-        "token.istitle()": token.istitle(),
-        "token.isdigit()": token.isdigit(),
-        "pos": pos,
+        BIAS: 1.0,
+        TOKEN_LOWER: token.lower(),
+        TOKEN_SUF3: token[-3:],
+        TOKEN_SUF2: token[-2:],
+        TOKEN_ISUPPER: token.isupper(),
+        TOKEN_ISTITLE: token.istitle(),
+        TOKEN_ISDIGIT: token.isdigit(),
+        POS: pos,
     }
     # previous token
     if i > 0:
         token1, pos1 = sent[i - 1]
         features.update(
             {
-                "-1:token.lower()": token1.lower(),
-                "-1:pos": pos1,
+                PREV_TOKEN_LOWER: token1.lower(),
+                PREV_POS: pos1,
             }
         )
     else:
-        features["BOS"] = True
+        features[BOS] = True
     # next token
     if i < len(sent) - 1:
         token1, pos1 = sent[i + 1]
-        features.update({"+1:token.lower()": token1.lower(), "+1:pos": pos1})
+        features.update({NEXT_TOKEN_LOWER: token1.lower(), NEXT_POS: pos1})
     else:
-        features["EOS"] = True
+        features[EOS] = True
     return features
 
 
 def sent_to_features(sent: SentTP) -> List[dict]:
-    return [word2features(sent, i) for i in range(len(sent))]
+    """
+    Same features as word2features for every token, but each token's string
+    methods run once and are reused for its neighbours' -1:/+1: features.
+    """
+    pre = [
+        (t.lower(), t[-3:], t[-2:], t.isupper(), t.istitle(), t.isdigit(), p)
+        for t, p in sent
+    ]
+    n = len(pre)
+    out = []
+    for i, (tl, s3, s2, iu, it, idg, pos) in enumerate(pre):
+        features = {
+            BIAS: 1.0,
+            TOKEN_LOWER: tl,
+            TOKEN_SUF3: s3,
+            TOKEN_SUF2: s2,
+            TOKEN_ISUPPER: iu,
+            TOKEN_ISTITLE: it,
+            TOKEN_ISDIGIT: idg,
+            POS: pos,
+        }
+        if i > 0:
+            prev = pre[i - 1]
+            features[PREV_TOKEN_LOWER] = prev[0]
+            features[PREV_POS] = prev[6]
+        else:
+            features[BOS] = True
+        if i < n - 1:
+            nxt = pre[i + 1]
+            features[NEXT_TOKEN_LOWER] = nxt[0]
+            features[NEXT_POS] = nxt[6]
+        else:
+            features[EOS] = True
+        out.append(features)
+    return out
 
 
 def prepare_crf_data(sents: List[SentTP], labels: List[List[str]]):
@@ -65,6 +137,21 @@ def prepare_crf_data(sents: List[SentTP], labels: List[List[str]]):
     return X, y
 
 
+def to_item_sequences(X) -> List[pycrfsuite.ItemSequence]:
+    """
+    Convert feature dicts to pycrfsuite ItemSequences once, so the Python dicts
+    can be dropped and fit/predict hand CRFsuite its native structure directly.
+    Every value is kept, False included: CRFsuite creates an (attribute, label)
+    feature for each attribute it sees, even when its value is 0, so dropping
+    them would change the trained model.
+    Sequences that are already ItemSequences are passed through.
+    """
+    return [
+        xseq if isinstance(xseq, pycrfsuite.ItemSequence) else pycrfsuite.ItemSequence(xseq)
+        for xseq in X
+    ]
+
+
 class CRFNER:
     def __init__(self, **crf_kwargs):
         self.model = sklearn_crfsuite.CRF(
@@ -77,10 +164,10 @@ class CRFNER:
         )
 
     def fit(self, X_train, y_train):
-        self.model.fit(X_train, y_train)
+        self.model.fit(to_item_sequences(X_train), y_train)
 
     def predict(self, X):
-        return self.model.predict(X)
+        return self.model.predict(to_item_sequences(X))
 
     def save(self, path):
         import joblib
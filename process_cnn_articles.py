@@ -18,17 +18,33 @@ import argparse
 import json
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
 from pathlib import Path
 from typing import List, Optional
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib parser
+    orjson = None
 
-def remove_blank_lines(file):
-    with open(file, 'r') as my_file, open("temp.txt", 'w') as temp_file:
-        for line in my_file:
-            if not line.isspace(): # Checks if line is not just whitespace
-                temp_file.write(line)
-    import shutil
-    shutil.move("temp.txt", file) # Replaces the original file with the temporary one
+
+def _loads(data: bytes):
+    """Parse JSON from bytes, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Input files to process; suffixes match case-insensitively, like Path.suffix.lower()
+INPUT_FILE_PATTERNS = ('*.[jJ][sS][oO][nN]', '*.[jJ][sS][oO][nN][lL]', '*.[tT][xX][tT]')
+
+# Compiled once at import; split_sentences_regex runs for every article.
+_WS = re.compile(r'\s+')
+# Split on sentence-ending punctuation followed by whitespace and a capital or quote/number.
+# This is not perfect but works well for many news articles.
+_SENT = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9"\'“‘])')
 
 
 def split_sentences_regex(text: str) -> List[str]:
@@ -36,10 +52,8 @@ def split_sentences_regex(text: str) -> List[str]:
     if not text:
         return []
     # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text.strip())
-    # Split on sentence-ending punctuation followed by whitespace and a capital or quote/number.
-    # This is not perfect but works well for many news articles.
-    parts = re.split(r'(?<=[.!?])\s+(?=[A-Z0-9"\'“‘])', text)
+    text = _WS.sub(' ', text).strip()
+    parts = _SENT.split(text)
     # Trim and filter empties
     sentences = [p.strip() for p in parts if p.strip()]
     return sentences
@@ -50,11 +64,10 @@ def split_sentences_nltk(text: str):
 
 def extract_articles_from_json(path: Path):
     """Yield article dicts from a .json file. Supports single object, list of objects."""
-    with path.open('r', encoding='utf-8') as f:
-        try:
-            data = json.load(f)
-        except Exception as e:
-            raise RuntimeError(f"Failed to parse JSON file {path}: {e}")
+    try:
+        data = _loads(path.read_bytes())
+    except Exception as e:
+        raise RuntimeError(f"Failed to parse JSON file {path}: {e}")
     if isinstance(data, list):
         for item in data:
             if isinstance(item, dict):
@@ -77,17 +90,16 @@ def extract_articles_from_json(path: Path):
 
 def extract_articles_from_jsonl(path: Path):
     """Yield article dicts from a .jsonl file (one JSON object per line)."""
-    with path.open('r', encoding='utf-8') as f:
-        for lineno, line in enumerate(f, start=1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except Exception as e:
-                raise RuntimeError(f"Failed to parse JSONL {path} line {lineno}: {e}")
-            if isinstance(obj, dict):
-                yield obj
+    for lineno, line in enumerate(path.read_bytes().splitlines(), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = _loads(line)
+        except Exception as e:
+            raise RuntimeError(f"Failed to parse JSONL {path} line {lineno}: {e}")
+        if isinstance(obj, dict):
+            yield obj
 
 def find_text_field(article: dict) -> Optional[str]:
     """Return the text content for an article dict or None."""
@@ -99,7 +111,7 @@ def find_text_field(article: dict) -> Optional[str]:
     val = article.get('text')
     if isinstance(val, list):
         # join list of strings
-        return ' '.join(str(x) for x in val)
+        return ' '.join([str(x) for x in val])
     if val is not None:
         return str(val)
     # No text found
@@ -112,6 +124,72 @@ def choose_id(article: dict, fallback: str) -> str:
             return str(article[key])
     return fallback
 
+def iter_input_files(input_dir: Path):
+    """Yield the .json/.jsonl/.txt files under input_dir, one glob per suffix."""
+    for path in chain.from_iterable(input_dir.rglob(pattern) for pattern in INPUT_FILE_PATTERNS):
+        if path.is_file():
+            yield path
+
+
+def _process_file(path: Path, use_nltk: bool = False):
+    """
+    Split every article in one input file into sentences.
+    Returns (articles_seen, articles_written, output_bytes) where output_bytes
+    holds the file's sentences, one per line.
+    """
+    total_articles = 0
+    written = 0
+    lines = []
+    try:
+        if path.suffix.lower() == '.jsonl':
+            generator = extract_articles_from_jsonl(path)
+        elif path.suffix.lower() == '.json':
+            generator = extract_articles_from_json(path)
+        elif path.suffix.lower() == '.txt':
+            # treat each txt file as one document
+            text = path.read_text(encoding='utf-8').strip()
+            article = {'text': text}
+            generator = (article for _ in (0,) for article in (article,))
+        else:
+            return total_articles, written, b''
+
+        for idx, article in enumerate(generator):
+            total_articles += 1
+            text = find_text_field(article)
+            if not text:
+                continue
+            # Choose id: prefer article id/url otherwise filename + index
+            fallback = f"{path.name}"
+            if path.suffix.lower() in ('.jsonl',):
+                # for jsonl, incorporate line idx to make unique
+                fallback = f"{path.name}:{idx}"
+            aid = choose_id(article, fallback)
+
+            if use_nltk:
+                sentences = split_sentences_nltk(text)
+            else:
+                sentences = split_sentences_regex(text)
+
+            # Normalize sentences: ensure strings, strip
+            sentences = [s.strip() for s in sentences if s and s.strip()]
+            if not sentences:
+                continue
+
+            #record = {"id": aid, "sentences": sentences}
+            record = sentences
+            for sentence in record:
+                if not sentence.startswith("Source: CNN") and not sentence.startswith("See Full Web Article"):
+                    # one line per sentence line, skipping blank ones
+                    # (e.g. paragraph breaks kept inside an NLTK sentence)
+                    lines.extend(line for line in sentence.split('\n') if line.strip())
+            written += 1
+    except Exception as e:
+        print(f"Warning: failed to process {path}: {e}")
+
+    output = ''.join([line + '\n' for line in lines]).encode('utf-8')
+    return total_articles, written, output
+
+
 def process_directory(input_dir: Path, output_file: Path, use_nltk: bool = False):
     if use_nltk:
         # lazy import and ensure punkt is available (user must download beforehand)
@@ -120,61 +198,20 @@ def process_directory(input_dir: Path, output_file: Path, use_nltk: bool = False
         except Exception as e:
             raise RuntimeError("NLTK selected but not installed. Install with: pip install nltk") from e
 
-    files = list(input_dir.rglob('*'))
-    files = [p for p in files if p.is_file() and p.suffix.lower() in ('.json', '.jsonl', '.txt')]
+    files_scanned = 0
     total_articles = 0
     written = 0
-    with output_file.open('w', encoding='utf-8') as out:
-        for path in files:
-            try:
-                if path.suffix.lower() == '.jsonl':
-                    generator = extract_articles_from_jsonl(path)
-                elif path.suffix.lower() == '.json':
-                    generator = extract_articles_from_json(path)
-                elif path.suffix.lower() == '.txt':
-                    # treat each txt file as one document
-                    text = path.read_text(encoding='utf-8').strip()
-                    article = {'text': text}
-                    generator = (article for _ in (0,) for article in (article,))
-                else:
-                    continue
-
-                for idx, article in enumerate(generator):
-                    total_articles += 1
-                    text = find_text_field(article)
-                    if not text:
-                        continue
-                    # Choose id: prefer article id/url otherwise filename + index
-                    fallback = f"{path.name}"
-                    if path.suffix.lower() in ('.jsonl',):
-                        # for jsonl, incorporate line idx to make unique
-                        fallback = f"{path.name}:{idx}"
-                    aid = choose_id(article, fallback)
-
-                    if use_nltk:
-                        sentences = split_sentences_nltk(text)
-                    else:
-                        sentences = split_sentences_regex(text)
-
-                    # Normalize sentences: ensure strings, strip
-                    sentences = [s.strip() for s in sentences if s and s.strip()]
-                    if not sentences:
-                        continue
-
-                    #record = {"id": aid, "sentences": sentences}
-                    record = sentences
-                    for sentence in record:
-                        if not sentence.startswith("Source: CNN") and not sentence.startswith("See Full Web Article"):
-                            if sentence.endswith('\n\n'):
-                                sentence.rstrip('\n')
-                            out.write(sentence)
-                            if not sentence.endswith("\n"):
-                                out.write("\n")
-                    written += 1
-            except Exception as e:
-                print(f"Warning: failed to process {path}: {e}")
-
-    print(f"Finished. Files scanned: {len(files)}. Articles seen: {total_articles}. Articles written: {written}.")
+    # Files are split in worker processes; map() yields results in input order,
+    # so the output is written from here exactly as a sequential run would.
+    with ProcessPoolExecutor() as ex, output_file.open('wb', buffering=1 << 20) as out:
+        files = iter_input_files(input_dir)
+        for seen, wrote, output in ex.map(partial(_process_file, use_nltk=use_nltk), files, chunksize=32):
+            files_scanned += 1
+            total_articles += seen
+            written += wrote
+            out.write(output)
+
+    print(f"Finished. Files scanned: {files_scanned}. Articles seen: {total_articles}. Articles written: {written}.")
     print(f"Output written to: {output_file}")
 
 def main():
@@ -188,7 +225,6 @@ def main():
         raise SystemExit(f"Input directory does not exist or is not a directory: {args.input_dir}")
 
     process_directory(args.input_dir, args.output_file, use_nltk=args.use_nltk)
-    remove_blank_lines(args.output_file)
 
 
 if __name__ == "__main__":
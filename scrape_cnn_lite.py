@@ -5,19 +5,30 @@ Scrapes articles from lite.cnn.com and stores them with metadata
 """
 
 import os
+import asyncio
 import json
-import hashlib
 import re
-import requests
+import httpx
+import xxhash
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
-from bs4 import BeautifulSoup
 from pathlib import Path
-from time import sleep
+from selectolax.lexbor import LexborHTMLParser
 from urllib.parse import urljoin, urlparse
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
 # Configuration constants
 MAX_ARTICLES_PER_RUN = 110
+# Minimum seconds between the starts of two requests to CNN (as when requests were serial)
 SLEEP_TIME = 2
+MAX_CONCURRENT_REQUESTS = 8
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (compatible; ArticleScraper/1.0)'
+}
 DEFAULT_TITLE = 'No title found'
 DEFAULT_TEXT = 'No text found'
 AUTHOR_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv'}
@@ -29,34 +40,63 @@ URL_BLOCK_LIST = {
     'https://www.cnn.com/ad-choices',
 }
 # Normalize to handle equivalent URLs with or without trailing slash.
-NORMALIZED_URL_BLOCK_LIST = {url.rstrip('/') for url in URL_BLOCK_LIST}
+NORMALIZED_URL_BLOCK_LIST = frozenset(url.rstrip('/') for url in URL_BLOCK_LIST)
+ABSOLUTE_URL_PREFIXES = ('http://', 'https://')
+ARTICLE_URL_PATTERNS = ('/202', '/article/', '/news/', '/politics/', '/business/', '/world/')
+# Substring (not prefix) matches, so scan for all of them in one regex search
+ARTICLE_URL_PATTERN = re.compile('|'.join(re.escape(pattern) for pattern in ARTICLE_URL_PATTERNS))
 CNN_SUFFIX_PATTERN = re.compile(r',\s*CNN\s*$', re.IGNORECASE)
+BY_PREFIX_PATTERN = re.compile(r'^\s*by\s+', re.IGNORECASE)
+AUTHOR_CONJUNCTION_PATTERN = re.compile(r'\s+(?:and|&)\s+')
 CNN_AUTHOR_TOKEN = 'CNN'
+# Articles saved before the switch to xxh3 carry a SHA256 hex digest.
+LEGACY_HASH_LENGTH = 64
+# One hash per line, kept next to the articles so startup need not parse every file.
+# Not a .txt file: process_cnn_articles.py reads .txt files in the directory as documents.
+HASH_INDEX_FILENAME = 'hashes.idx'
+# Selectors tried in order for each article field
+TITLE_SELECTORS = ['h1', 'title', '.article-title', '[class*="headline"]']
+DATE_SELECTORS = ['time', '.timestamp', '[class*="date"]', '[datetime]']
+# NOTE: the class selector, .byline--lite is the one cnn-lite uses
+AUTHOR_SELECTORS = ['.author', '[class*="author"]', '[rel="author"]', '.byline--lite']
+TEXT_SELECTORS = [
+    'article',
+    '.article-body',
+    '[class*="article-content"]',
+    '[class*="story-body"]',
+    'main'
+]
+# CNN Lite pages carry no date element; one walk with the joined query rules out all selectors
+DATE_QUERY = ', '.join(DATE_SELECTORS)
 
 def get_article_hash(content):
-    """Generate SHA256 hash of article text for deduplication"""
-    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    """Generate xxh3-128 hash of article text for deduplication"""
+    return xxhash.xxh3_128(content.encode('utf-8')).hexdigest()
+
 
+def to_absolute_url(base_url, href):
+    """Resolve href against base_url; absolute links are returned as-is without urljoin"""
+    if href.startswith(ABSOLUTE_URL_PREFIXES):
+        return href
+    return urljoin(base_url, href)
 
-def extract_article_links(soup, base_url):
-    """Extract all anchor tag links from the article"""
+
+def extract_article_links(anchors, base_url):
+    """Extract all anchor tag links from the article, given its (href, link text) pairs"""
     links = []
     base_parsed = urlparse(base_url)
     base_path = base_parsed.path.rstrip('/')
-    for a_tag in soup.find_all('a', href=True):
-        href = a_tag.get('href', '')
+    base_is_cnn = base_parsed.netloc.endswith('cnn.com')
+    for href, link_text in anchors:
         # Convert relative URLs to absolute
-        absolute_url = urljoin(base_url, href)
+        absolute_url = to_absolute_url(base_url, href)
         if absolute_url.rstrip('/') in NORMALIZED_URL_BLOCK_LIST:
             continue
-        parsed_url = urlparse(absolute_url)
-        if (
-            parsed_url.netloc.endswith('cnn.com')
-            and base_parsed.netloc.endswith('cnn.com')
-            and parsed_url.path.rstrip('/') == base_path
-        ):
-            continue
-        link_text = a_tag.get_text(strip=True)
+        # Skip links back to this article's route on any cnn.com host
+        if base_is_cnn:
+            parsed_url = urlparse(absolute_url)
+            if parsed_url.netloc.endswith('cnn.com') and parsed_url.path.rstrip('/') == base_path:
+                continue
         links.append({
             'url': absolute_url,
             'text': link_text
@@ -68,11 +108,12 @@ def split_author_text(author_text):
     """Split author text into individual author names."""
     if not author_text:
         return []
-    cleaned = re.sub(r'^\s*by\s+', '', author_text, flags=re.IGNORECASE).strip()
+    cleaned = BY_PREFIX_PATTERN.sub('', author_text).strip()
     if not cleaned:
         return []
-    has_conjunction = bool(re.search(r'\s+(?:and|&)\s+', cleaned))
-    parts = re.split(r'\s+(?:and|&)\s+', cleaned)
+    # One scan both splits on the conjunctions and tells us whether there were any
+    parts = AUTHOR_CONJUNCTION_PATTERN.split(cleaned)
+    has_conjunction = len(parts) > 1
     authors = []
     for part in parts:
         comma_parts = [entry.strip() for entry in part.split(',') if entry.strip()]
@@ -103,138 +144,208 @@ def split_author_text(author_text):
     return cleaned_authors
 
 
-def extract_article_data(article_url, session):
-    """Extract article data from a given URL"""
-    try:
-        response = session.get(article_url, timeout=30)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Extract title - try multiple selectors
-        title = None
-        title_selectors = ['h1', 'title', '.article-title', '[class*="headline"]']
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
-            if title_elem:
-                title = title_elem.get_text(strip=True)
+def _stripped_strings(node):
+    """Yield the non-blank, stripped text nodes under node, in document order"""
+    for child in node.traverse(include_text=True):
+        if child.tag == '-text':
+            text = child.text_content.strip()
+            if text:
+                yield text
+
+
+def _extract_fields(html):
+    """Extract (title, date, authors, text, anchors) from article HTML with selectolax"""
+    tree = LexborHTMLParser(html)
+
+    # Extract title - try multiple selectors
+    title = None
+    for selector in TITLE_SELECTORS:
+        title_elem = tree.css_first(selector)
+        if title_elem is not None:
+            title = title_elem.text(strip=True)
+            break
+
+    # Extract date - try multiple selectors
+    date = None
+    if tree.css_first(DATE_QUERY) is not None:
+        for selector in DATE_SELECTORS:
+            date_elem = tree.css_first(selector)
+            if date_elem is not None:
+                date = date_elem.attributes.get('datetime') or date_elem.text(strip=True)
                 break
 
-        # Extract date - try multiple selectors
-        date = None
-        date_selectors = ['time', '.timestamp', '[class*="date"]', '[datetime]']
-        for selector in date_selectors:
-            date_elem = soup.select_one(selector)
-            if date_elem:
-                date = date_elem.get('datetime') or date_elem.get_text(strip=True)
+    # Extract authors - try multiple selectors
+    authors = []
+    seen_authors = set()
+    for selector in AUTHOR_SELECTORS:
+        for author_elem in tree.css(selector):
+            author_text = " ".join(_stripped_strings(author_elem))
+            for author in split_author_text(author_text):
+                if author not in seen_authors:
+                    authors.append(author)
+                    seen_authors.add(author)
+        if authors:
+            break
+
+    # Extract article text - try multiple selectors for article body
+    text = None
+    for selector in TEXT_SELECTORS:
+        text_elem = tree.css_first(selector)
+        if text_elem is not None:
+            # Get all paragraphs within the article
+            paragraphs = text_elem.css('p')
+            if paragraphs:
+                text = '\n\n'.join([t for t in (p.text(strip=True) for p in paragraphs) if t])
                 break
 
-        # Extract authors - try multiple selectors
-        authors = []
-        seen_authors = set()
-        # NOTE: the class selector, .byline--lite is the one cnn-lite uses
-        author_selectors = ['.author', '[class*="author"]', '[rel="author"]', '.byline--lite']
-        for selector in author_selectors:
-            author_elems = soup.select(selector)
-            for author_elem in author_elems:
-                author_text = " ".join(author_elem.stripped_strings)
-                for author in split_author_text(author_text):
-                    if author not in seen_authors:
-                        authors.append(author)
-                        seen_authors.add(author)
-            if authors:
-                break
+    # Fallback: get all paragraphs if no article container found
+    if not text:
+        paragraphs = tree.css('p')
+        if paragraphs:
+            text = '\n\n'.join([t for t in (p.text(strip=True) for p in paragraphs) if t])
 
-        # Extract article text - try multiple selectors for article body
-        text = None
-        text_selectors = [
-            'article',
-            '.article-body',
-            '[class*="article-content"]',
-            '[class*="story-body"]',
-            'main'
-        ]
-        for selector in text_selectors:
-            text_elem = soup.select_one(selector)
-            if text_elem:
-                # Get all paragraphs within the article
-                paragraphs = text_elem.find_all('p')
-                if paragraphs:
-                    text = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-                    break
-
-        # Fallback: get all paragraphs if no article container found
-        if not text:
-            paragraphs = soup.find_all('p')
-            if paragraphs:
-                text = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+    anchors = [(a.attributes.get('href') or '', a.text(strip=True)) for a in tree.css('a[href]')]
+    return title, date, authors, text, anchors
 
-        # Extract all links from the article
-        links = extract_article_links(soup, article_url)
 
-        title_value = title or DEFAULT_TITLE
-        text_value = text or DEFAULT_TEXT
+def parse_article_data(article_url, html):
+    """Extract article data from the HTML of an article page"""
+    title, date, authors, text, anchors = _extract_fields(html)
 
-        # Generate hash of the article text
-        article_hash = get_article_hash(text_value)
+    # Extract all links from the article
+    links = extract_article_links(anchors, article_url)
 
-        return {
-            'url': article_url,
-            'title': title_value,
-            'date': date or datetime.now(timezone.utc).isoformat(),
-            'authors': authors,
-            'text': text_value,
-            'links': links,
-            'hash': article_hash,
-            'scraped_at': datetime.now(timezone.utc).isoformat()
-        }
+    title_value = title or DEFAULT_TITLE
+    text_value = text or DEFAULT_TEXT
+
+    # Generate hash of the article text
+    article_hash = get_article_hash(text_value)
+
+    return {
+        'url': article_url,
+        'title': title_value,
+        'date': date or datetime.now(timezone.utc).isoformat(),
+        'authors': authors,
+        'text': text_value,
+        'links': links,
+        'hash': article_hash,
+        'scraped_at': datetime.now(timezone.utc).isoformat()
+    }
+
+
+def create_client():
+    """Create the keep-alive HTTP client shared by every request of a run"""
+    limits = httpx.Limits(
+        max_connections=MAX_CONCURRENT_REQUESTS,
+        max_keepalive_connections=MAX_CONCURRENT_REQUESTS,
+    )
+    return httpx.AsyncClient(http2=True, limits=limits, headers=REQUEST_HEADERS, follow_redirects=True)
+
+
+class RateLimiter:
+    """Space request starts at least `interval` seconds apart."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.next_start = None
+
+    async def acquire(self):
+        """Wait until the next request is allowed to start."""
+        now = asyncio.get_running_loop().time()
+        start = now if self.next_start is None else max(self.next_start, now)
+        # Reserve the slot before sleeping so concurrent callers queue up behind it
+        self.next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
 
-    except Exception as e:
-        print(f"Error extracting article from {article_url}: {e}")
-        return None
 
+async def fetch_article_page(article_url, client, semaphore, rate_limiter):
+    """Fetch the raw HTML of an article page.
 
-def get_article_links_from_homepage(homepage_url, session):
+    At most MAX_CONCURRENT_REQUESTS requests are in flight at once, and request
+    starts are spaced by the rate limiter so the servers are not overloaded.
+    """
+    async with semaphore:
+        await rate_limiter.acquire()
+        response = await client.get(article_url, timeout=30)
+        response.raise_for_status()
+        return response.content
+
+
+async def fetch_and_parse_articles(article_urls, client):
+    """Fetch article pages concurrently, then parse them in a process pool.
+
+    Returns one article dict per URL, in input order, with None for any
+    article that could not be fetched or parsed.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    # Requests start at most once every SLEEP_TIME seconds, as the serial scraper
+    # did; concurrency only overlaps their response times
+    rate_limiter = RateLimiter(SLEEP_TIME)
+    pages = await asyncio.gather(
+        *[fetch_article_page(url, client, semaphore, rate_limiter) for url in article_urls],
+        return_exceptions=True,
+    )
+
+    articles = [None] * len(article_urls)
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor() as pool:
+        parsing = {}
+        for idx, (article_url, page) in enumerate(zip(article_urls, pages)):
+            if isinstance(page, Exception):
+                print(f"Error extracting article from {article_url}: {page}")
+                continue
+            parsing[idx] = loop.run_in_executor(pool, parse_article_data, article_url, page)
+        results = await asyncio.gather(*parsing.values(), return_exceptions=True)
+    for idx, result in zip(parsing, results):
+        if isinstance(result, Exception):
+            print(f"Error extracting article from {article_urls[idx]}: {result}")
+        else:
+            articles[idx] = result
+    return articles
+
+
+async def get_article_links_from_homepage(homepage_url, client):
     """Get all article links from the CNN Lite homepage"""
     try:
-        response = session.get(homepage_url, timeout=30)
+        response = await client.get(homepage_url, timeout=30)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        tree = LexborHTMLParser(response.content)
 
-        # Find all links that look like articles
-        article_links = []
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag.get('href')
+        # Find all links that look like articles (dict keys keep first-seen order)
+        article_links = {}
+        for a_tag in tree.css('a[href]'):
             # Convert relative URLs to absolute
-            absolute_url = urljoin(homepage_url, href)
+            absolute_url = to_absolute_url(homepage_url, a_tag.attributes.get('href') or '')
 
             # Filter for article URLs (typically contain /2024/, /2025/, /2026/ etc. or /article/)
             parsed = urlparse(absolute_url)
             # Ensure the domain is exactly cnn.com or a subdomain of cnn.com
             if parsed.netloc and (parsed.netloc == 'cnn.com' or parsed.netloc.endswith('.cnn.com')):
                 # Basic heuristic: URLs with year patterns or containing "article" or news sections
-                if any(x in absolute_url for x in ['/202', '/article/', '/news/', '/politics/', '/business/', '/world/']):
-                    if absolute_url not in article_links:
-                        article_links.append(absolute_url)
+                if ARTICLE_URL_PATTERN.search(absolute_url):
+                    article_links[absolute_url] = None
 
-        return article_links
+        return list(article_links)
 
     except Exception as e:
         print(f"Error getting article links from homepage: {e}")
         return []
 
 
-def load_existing_text_hashes(output_dir) -> set:
-    """Load existing article text hashes from stored JSON files."""
+def scan_existing_text_hashes(output_dir) -> set:
+    """Compute existing article text hashes by reading every stored JSON file."""
     existing_hashes = set()
     for json_file in output_dir.glob('*.json'):
         try:
             with open(json_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             has_authors_field = data.get('authors') is not None
-            if data.get('hash') and has_authors_field:
-                existing_hashes.add(data['hash'])
+            stored_hash = data.get('hash')
+            # Legacy SHA256 hashes are recomputed from the text so they compare with new ones
+            if stored_hash and has_authors_field and len(stored_hash) != LEGACY_HASH_LENGTH:
+                existing_hashes.add(stored_hash)
                 continue
             text_value = data.get('text', '')
             existing_hashes.add(get_article_hash(text_value))
@@ -243,6 +354,49 @@ def load_existing_text_hashes(output_dir) -> set:
     return existing_hashes
 
 
+def write_hash_index(output_dir, hashes):
+    """Atomically replace the hash index with the given hashes."""
+    index_path = output_dir / HASH_INDEX_FILENAME
+    tmp_path = index_path.with_name(index_path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(''.join([f"{h}\n" for h in sorted(hashes)]))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, index_path)
+    # The rename bumps the directory mtime; touch the index so it counts as current.
+    os.utime(index_path)
+
+
+def append_to_hash_index(output_dir, article_hash):
+    """Record a newly saved article's hash in the index, if there is one."""
+    index_path = output_dir / HASH_INDEX_FILENAME
+    if not index_path.exists():
+        # A partial index would hide every other article; the next run rebuilds it.
+        return
+    with open(index_path, 'a', encoding='utf-8') as f:
+        f.write(f"{article_hash}\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def load_existing_text_hashes(output_dir) -> set:
+    """Load existing article text hashes, from the hash index when it is up to date."""
+    index_path = output_dir / HASH_INDEX_FILENAME
+    try:
+        if index_path.stat().st_mtime >= output_dir.stat().st_mtime:
+            return set(index_path.read_text(encoding='utf-8').split())
+    except OSError:
+        pass
+    # The index is gitignored, so a fresh checkout (every scheduled CI run) always
+    # lands here: the full scan is only avoided by repeated runs in one working tree.
+    existing_hashes = scan_existing_text_hashes(output_dir)
+    try:
+        write_hash_index(output_dir, existing_hashes)
+    except OSError as e:
+        print(f"Error writing hash index {index_path}: {e}")
+    return existing_hashes
+
+
 def save_article(article_data, output_dir):
     """Save article data to a JSON file"""
     if not article_data:
@@ -253,12 +407,36 @@ def save_article(article_data, output_dir):
     filepath = output_dir / filename
 
     # Save the article data
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(article_data, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        payload = orjson.dumps(article_data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(article_data, indent=2, ensure_ascii=False).encode('utf-8')
+    filepath.write_bytes(payload)
+
+    append_to_hash_index(output_dir, article_data['hash'])
 
     print(f"Saved article: {article_data['title'][:50]}... -> {filename}")
 
 
+async def scrape_homepage(homepage_url):
+    """Fetch the homepage's article links, then the articles themselves.
+
+    Returns (article_urls, articles), with None for articles that failed.
+    """
+    async with create_client() as client:
+        print(f"Fetching article links from {homepage_url}...")
+        article_links = await get_article_links_from_homepage(homepage_url, client)
+        print(f"Found {len(article_links)} potential article links")
+        if not article_links:
+            return [], []
+
+        # Fetch and parse the articles concurrently
+        article_urls = article_links[:MAX_ARTICLES_PER_RUN]
+        print(f"Fetching {len(article_urls)} articles ({MAX_CONCURRENT_REQUESTS} at a time)...")
+        articles = await fetch_and_parse_articles(article_urls, client)
+    return article_urls, articles
+
+
 def main():
     """Main function to scrape CNN Lite articles"""
     print("Starting CNN Lite article scraper...")
@@ -271,29 +449,18 @@ def main():
     # CNN Lite homepage
     homepage_url = 'https://lite.cnn.com'
 
-    # Create a session for connection pooling
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (compatible; ArticleScraper/1.0)'
-    })
-
-    # Get all article links from homepage
-    print(f"Fetching article links from {homepage_url}...")
-    article_links = get_article_links_from_homepage(homepage_url, session)
-
-    print(f"Found {len(article_links)} potential article links")
-
-    if not article_links:
+    # One keep-alive client for the homepage and every article
+    article_urls, articles = asyncio.run(scrape_homepage(homepage_url))
+    if not article_urls:
         print("No article links found. This might be due to website structure changes.")
         print("Please check the website manually.")
         return
 
     # Process each article
     successful_articles = 0
-    for idx, article_url in enumerate(article_links[:MAX_ARTICLES_PER_RUN], 1):
-        print(f"\n[{idx}/{min(MAX_ARTICLES_PER_RUN, len(article_links))}] Processing: {article_url}")
+    for idx, (article_url, article_data) in enumerate(zip(article_urls, articles), 1):
+        print(f"\n[{idx}/{len(article_urls)}] Processing: {article_url}")
 
-        article_data = extract_article_data(article_url, session)
         try:
             if article_data:
                 if article_data['hash'] in existing_text_hashes:
@@ -302,8 +469,6 @@ def main():
                     save_article(article_data, output_dir)
                     existing_text_hashes.add(article_data['hash'])
                     successful_articles += 1
-            # sleep for some seconds to not overload servers
-            sleep(SLEEP_TIME)
         except Exception as e:
             print(f"Exception on article: {e!r}")
             print(f"Article data for root causing: {article_data!r}")
@@ -0,0 +1,143 @@
+"""
+Cache sentence-split, POS-tagged articles as a Parquet table.
+
+Tokenizing and tagging are by far the slowest steps of the CRF workflow, so run
+them once and reload the (token, pos) sentences from disk while iterating on
+features:
+  python -m scripts.build_token_cache [output.parquet] [nltk|spacy]
+
+Columns: article_key:dictionary<int32, string> (the article file's stem, i.e. its
+hash; align labels on this, not on row order), sent_id:int32, tok_id:int16,
+token:string, pos:dictionary<int8, string> (the tag set is small, ~1 byte per row).
+Articles are stored in file name order. The schema metadata records the
+preprocess backend that produced the tokens; a cache is only read back for that
+backend. The cache is stale once the scraper adds articles (see cache_is_current).
+"""
+import sys
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from scripts import data_loader as dl
+from scripts import preprocess as pp
+
+TOKEN_CACHE = Path("toks.parquet")
+
+SCHEMA = pa.schema(
+    [
+        ("article_key", pa.dictionary(pa.int32(), pa.string())),
+        ("sent_id", pa.int32()),
+        ("tok_id", pa.int16()),
+        ("token", pa.string()),
+        ("pos", pa.dictionary(pa.int8(), pa.string())),
+    ]
+)
+
+
+def write_token_cache(
+    keyed_articles: Iterable[Tuple[str, List[List[Tuple[str, str]]]]],
+    path: Path = TOKEN_CACHE,
+    backend: str = pp.DEFAULT_BACKEND,
+) -> int:
+    """
+    Write (article_key, sentences of (token, pos)) pairs, tagged with `backend`, to
+    a Parquet file. Rows are stored in article/sentence/token order. Returns the
+    number of rows.
+    """
+    article_keys, sent_ids, tok_ids, tokens, tags = [], [], [], [], []
+    for article_key, sents in keyed_articles:
+        for sent_id, sent in enumerate(sents):
+            for tok_id, (token, pos) in enumerate(sent):
+                article_keys.append(article_key)
+                sent_ids.append(sent_id)
+                tok_ids.append(tok_id)
+                tokens.append(token)
+                tags.append(pos)
+    table = pa.table(
+        {
+            "article_key": pa.array(article_keys, pa.string()).dictionary_encode().cast(SCHEMA.field("article_key").type),
+            "sent_id": pa.array(sent_ids, pa.int32()),
+            "tok_id": pa.array(tok_ids, pa.int16()),
+            "token": pa.array(tokens, pa.string()),
+            "pos": pa.array(tags, pa.string()).dictionary_encode().cast(SCHEMA.field("pos").type),
+        },
+        schema=SCHEMA.with_metadata({"backend": backend}),
+    )
+    pq.write_table(table, path)
+    return table.num_rows
+
+
+def iter_keyed_articles(data_dir: Path = dl.DATA_DIR) -> Iterator[Tuple[str, Dict]]:
+    """Yield (file stem, article) in file name order, skipping unreadable files like dl.iter_articles()."""
+    for p in sorted(dl.iter_article_files(data_dir)):
+        try:
+            yield p.stem, dl.load_article(p)
+        except Exception:
+            continue
+
+
+def build_token_cache(path: Path = TOKEN_CACHE, data_dir: Path = dl.DATA_DIR, backend: str = pp.DEFAULT_BACKEND) -> int:
+    """Tokenize and POS-tag every article across all cores with `backend` and cache the result."""
+    keys, articles = [], []
+    for key, article in iter_keyed_articles(data_dir):
+        keys.append(key)
+        articles.append(article)
+    # pipe_articles keeps input order, so results line up with keys
+    return write_token_cache(zip(keys, pp.pipe_articles(articles, backend=backend)), path, backend)
+
+
+def read_cache_backend(path: Path = TOKEN_CACHE) -> Optional[str]:
+    """Return the preprocess backend recorded in the cache, or None if it has none."""
+    metadata = pq.read_schema(path).metadata or {}
+    backend = metadata.get(b"backend")
+    return backend.decode() if backend else None
+
+
+def cache_is_current(path: Path = TOKEN_CACHE, data_dir: Path = dl.DATA_DIR, backend: str = pp.DEFAULT_BACKEND) -> bool:
+    """
+    True if the cache exists, was built with `backend` and is newer than the article
+    directory. Saving a new article bumps the directory's mtime (articles are never
+    edited in place).
+    """
+    try:
+        return path.stat().st_mtime >= data_dir.stat().st_mtime and read_cache_backend(path) == backend
+    except OSError:
+        return False
+
+
+def iter_cached_articles(
+    path: Path = TOKEN_CACHE, backend: str = pp.DEFAULT_BACKEND
+) -> Iterator[Tuple[str, List[List[Tuple[str, str]]]]]:
+    """
+    Yield (article_key, sentences of (token, pos)) in stored order; articles without
+    tokens are absent. Raises ValueError if the cache was built with another backend.
+    """
+    cached_backend = read_cache_backend(path)
+    if cached_backend != backend:
+        raise ValueError(f"{path} was built with the {cached_backend!r} backend, not {backend!r}; rebuild it")
+    table = pq.read_table(path, columns=["article_key", "sent_id", "token", "pos"])
+    rows = zip(
+        table.column("article_key").to_pylist(),
+        table.column("sent_id").to_pylist(),
+        table.column("token").to_pylist(),
+        table.column("pos").to_pylist(),
+    )
+    for article_key, article_rows in groupby(rows, key=lambda row: row[0]):
+        sents = groupby(article_rows, key=lambda row: row[1])
+        yield article_key, [[(token, pos) for _, _, token, pos in sent_rows] for _, sent_rows in sents]
+
+
+def iter_cached_sentences(path: Path = TOKEN_CACHE, backend: str = pp.DEFAULT_BACKEND) -> Iterator[List[Tuple[str, str]]]:
+    """Yield each cached sentence as a list of (token, pos) tuples, in stored order."""
+    for _, sents in iter_cached_articles(path, backend):
+        yield from sents
+
+
+if __name__ == "__main__":
+    out = Path(sys.argv[1]) if len(sys.argv) > 1 else TOKEN_CACHE
+    backend = sys.argv[2] if len(sys.argv) > 2 else pp.DEFAULT_BACKEND
+    n = build_token_cache(out, backend=backend)
+    print(f"Wrote {n} tokens ({backend} backend) to {out}")
@@ -6,6 +6,11 @@ from pathlib import Path
 import json
 from typing import Dict, Iterator, List
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib decoder
+    orjson = None
+
 DATA_DIR = Path("cnn-lite-articles")  # adjust to actual path in this repo
 
 
@@ -17,6 +22,8 @@ def iter_article_files(data_dir: Path = DATA_DIR) -> Iterator[Path]:
 
 def load_article(path: Path) -> Dict:
     """Load a single article. Return dict with keys like 'id', 'title', 'body'."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
     with path.open("r", encoding="utf8") as f:
         return json.load(f)
 
@@ -29,3 +36,4 @@ def iter_articles(data_dir: Path = DATA_DIR) -> Iterator[Dict]:
         except Exception as e:
             # consider logging
             continue
+
@@ -1,65 +1,159 @@
 """
-Tokenization and POS-tagging utilities using NLTK.
+Tokenization and POS-tagging utilities.
+
+Two backends, chosen explicitly with the `backend` argument: "nltk" (default;
+Punkt + NLTK word tokenizer + PerceptronTagger) or "spacy" (en_core_web_sm:
+sentences, tokens and Penn Treebank tags in one pass). Their token streams differ
+(spaCy splits infix hyphens and handles quotes differently), so token-level
+labels and cached outputs are only valid for the backend that produced them.
 
 Provides:
- - ensure_nltk_resources: download resources if missing
+ - ensure_nltk_resources: download resources if missing (not run on import; call it
+   before using the NLTK functions directly; pipe_articles calls it before its pool)
  - sentence_tokenize(text) -> List[str]
  - word_tokenize(sentence) -> List[str]
  - pos_tag_tokens(tokens) -> List[Tuple[str, str]]
- - article_to_sent_tokens_pos(article) -> List[List[Tuple[str,str]]]
+ - article_to_sent_tokens_pos(article, backend) -> List[List[Tuple[str,str]]]
+ - pipe_articles(articles, backend=...) -> Iterator[List[List[Tuple[str,str]]]]
 """
-from typing import List, Tuple, Dict
+import os
+from functools import lru_cache, partial
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, List, Tuple
 import nltk
+from nltk.tag import PerceptronTagger
+from nltk.tokenize import NLTKWordTokenizer
+
+try:
+    from nltk.tokenize import PunktTokenizer
+except ImportError:  # NLTK releases before punkt_tab
+    PunktTokenizer = None
+
+try:
+    import spacy
+except ImportError:  # only needed for the "spacy" backend
+    spacy = None
+
+BACKENDS = ("nltk", "spacy")
+DEFAULT_BACKEND = "nltk"
+
+# Install with: python -m spacy download en_core_web_sm
+SPACY_MODEL = "en_core_web_sm"
 
-# NLTK resources we need
-_NLTK_RESOURCES = ["punkt", "averaged_perceptron_tagger", "wordnet"]
+# The NLTK data this NLTK release loads, as nltk.data paths: newer releases read
+# punkt_tab and the JSON tagger (averaged_perceptron_tagger_eng), older ones the pickles
+_NLTK_RESOURCES = [
+    "tokenizers/punkt_tab" if PunktTokenizer is not None else "tokenizers/punkt",
+    "taggers/averaged_perceptron_tagger_eng"
+    if hasattr(PerceptronTagger, "load_from_json")
+    else "taggers/averaged_perceptron_tagger",
+]
+
+@lru_cache(maxsize=None)
+def _ensure_nltk_resource(resource: str) -> None:
+    """Download one NLTK resource (an nltk.data path) if missing; looked up at most once per process."""
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        nltk.download(resource.rsplit("/", 1)[-1])
 
 def ensure_nltk_resources(resources: List[str] = None):
-    """Download NLTK resources if they are not already present."""
+    """
+    Download NLTK resources (nltk.data paths, e.g. "tokenizers/punkt_tab") if
+    they are not already present. Defaults to what the NLTK tokenizer/tagger need.
+    """
     resources = resources or _NLTK_RESOURCES
     for r in resources:
-        try:
-            nltk.data.find(f"tokenizers/{r}") if r == "punkt" else nltk.data.find(f"taggers/{r}")
-        except LookupError:
-            nltk.download(r)
+        _ensure_nltk_resource(r)
 
-# Call once on import to be helpful in interactive runs (safe to remove if you prefer manual control)
-try:
-    ensure_nltk_resources()
-except Exception:
-    # In environments without internet, downloads may fail; raise when functions actually need the resources
-    pass
+@lru_cache(maxsize=None)
+def _get_tagger() -> PerceptronTagger:
+    """Build the PerceptronTagger (loading its model from disk) once per process."""
+    return PerceptronTagger()
+
+@lru_cache(maxsize=None)
+def _get_nlp():
+    """
+    Load the spaCy pipeline once per process. Only tok2vec, tagger (tag_) and
+    senter (sentences) run. Raises if spaCy or the model is not installed.
+    """
+    if spacy is None:
+        raise ImportError('the "spacy" backend needs spaCy installed')
+    return spacy.load(SPACY_MODEL, enable=["tok2vec", "tagger", "senter"])
+
+def _check_backend(backend: str) -> None:
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}, expected one of {BACKENDS}")
+
+def _article_text(article: Dict) -> str:
+    return article.get("body", article.get("text", ""))
+
+def _doc_to_sent_tokens_pos(doc) -> List[List[Tuple[str, str]]]:
+    """Convert a spaCy Doc -> list of sentences of (token, tag), dropping whitespace tokens."""
+    sents = ([(tok.text, tok.tag_) for tok in sent if not tok.is_space] for sent in doc.sents)
+    return [sent for sent in sents if sent]
+
+@lru_cache(maxsize=None)
+def _get_sent_tokenizer():
+    """Load the English Punkt sentence tokenizer once per process."""
+    if PunktTokenizer is None:
+        return nltk.data.load("tokenizers/punkt/english.pickle")
+    return PunktTokenizer("english")
+
+# The word tokenizer nltk.word_tokenize applies to each sentence
+_WORD_TOKENIZER = NLTKWordTokenizer()
 
 def sentence_tokenize(text: str) -> List[str]:
     """Return list of sentence strings from text."""
-    return nltk.sent_tokenize(text)
+    return _get_sent_tokenizer().tokenize(text)
 
 def word_tokenize(sentence: str) -> List[str]:
-    """Return list of token strings for a sentence."""
-    return nltk.word_tokenize(sentence)
+    """
+    Return list of token strings for a sentence. Unlike nltk.word_tokenize the
+    input is not re-split into sentences first; pass one sentence at a time.
+    """
+    return _WORD_TOKENIZER.tokenize(sentence)
 
 def pos_tag_tokens(tokens: List[str]) -> List[Tuple[str, str]]:
     """
     Return list of (token, pos_tag) pairs using NLTK's averaged_perceptron_tagger.
     Example: [('Apple', 'NNP'), ('is', 'VBZ'), ('big', 'JJ')]
     """
-    return nltk.pos_tag(tokens)
+    return _get_tagger().tag(tokens)
 
-def article_to_sent_tokens_pos(article: Dict) -> List[List[Tuple[str, str]]]:
+def article_to_sent_tokens_pos(article: Dict, backend: str = DEFAULT_BACKEND) -> List[List[Tuple[str, str]]]:
     """
     Convert article dict -> list of sentences, each a list of (token, pos) tuples.
     article expected to have 'body' or 'text' key.
     """
-    text = article.get("body", article.get("text", ""))
+    _check_backend(backend)
+    text = _article_text(article)
+    if backend == "spacy":
+        return _doc_to_sent_tokens_pos(_get_nlp()(text))
     sents = sentence_tokenize(text)
-    tokenized = []
-    for s in sents:
-        toks = word_tokenize(s)
-        toks_pos = pos_tag_tokens(toks)
-        tokenized.append(toks_pos)
-    return tokenized
+    return _get_tagger().tag_sents([word_tokenize(s) for s in sents])
+
+def pipe_articles(
+    articles: Iterable[Dict], batch_size: int = 64, n_process: int = None, backend: str = DEFAULT_BACKEND
+) -> Iterator[List[List[Tuple[str, str]]]]:
+    """
+    Yield article_to_sent_tokens_pos() for each article, in input order, using
+    all cores: batched nlp.pipe with spaCy, or a process pool with NLTK.
+    """
+    _check_backend(backend)
+    n_process = n_process or os.cpu_count() or 1
+    if backend == "spacy":
+        texts = (_article_text(article) for article in articles)
+        for doc in _get_nlp().pipe(texts, batch_size=batch_size, n_process=n_process):
+            yield _doc_to_sent_tokens_pos(doc)
+        return
+    # Once here, so the pool workers do not all probe (and download) at the same time
+    ensure_nltk_resources()
+    with Pool(n_process) as pool:
+        yield from pool.imap(partial(article_to_sent_tokens_pos, backend=backend), articles, chunksize=16)
 
 # Small helper for interactive sanity check
 if __name__ == "__main__":
     sample = "Apple is looking at buying U.K. startup for $1 billion. This is a test."
+    ensure_nltk_resources()
     print(article_to_sent_tokens_pos({"body": sample}))
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+from scripts.build_token_cache import (
+    SCHEMA,
+    cache_is_current,
+    iter_cached_articles,
+    iter_cached_sentences,
+    read_cache_backend,
+    write_token_cache,
+)
+
+
+class TestBuildTokenCache(unittest.TestCase):
+    def test_write_and_read_round_trip(self):
+        articles = [
+            ("b2", [[("Apple", "NNP"), ("is", "VBZ"), ("big", "JJ")], [("It", "PRP"), ("grew", "VBD")]]),
+            ("c3", []),
+            ("a1", [[("Hello", "UH")]]),
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "toks.parquet"
+
+            self.assertEqual(write_token_cache(articles, path, backend="nltk"), 6)
+            self.assertEqual(pq.read_schema(path).remove_metadata(), SCHEMA)
+            self.assertEqual(list(iter_cached_articles(path)), [articles[0], articles[2]])
+            self.assertEqual(
+                list(iter_cached_sentences(path)),
+                [sent for _, sents in articles for sent in sents],
+            )
+
+    def test_cache_is_current_only_when_newer_than_data_dir(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_dir = Path(tmp_dir) / "articles"
+            data_dir.mkdir()
+            path = Path(tmp_dir) / "toks.parquet"
+            self.assertFalse(cache_is_current(path, data_dir))
+
+            write_token_cache([("a1", [[("Hello", "UH")]])], path)
+            os.utime(data_dir, (1000, 1000))
+            self.assertTrue(cache_is_current(path, data_dir))
+
+            # a newly scraped article bumps the directory mtime
+            os.utime(data_dir)
+            os.utime(path, (1000, 1000))
+            self.assertFalse(cache_is_current(path, data_dir))
+
+    def test_cache_records_backend_and_refuses_another(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_dir = Path(tmp_dir) / "articles"
+            data_dir.mkdir()
+            os.utime(data_dir, (1000, 1000))
+            path = Path(tmp_dir) / "toks.parquet"
+            write_token_cache([("a1", [[("Hello", "UH")]])], path, backend="spacy")
+
+            self.assertEqual(read_cache_backend(path), "spacy")
+            self.assertTrue(cache_is_current(path, data_dir, backend="spacy"))
+            self.assertFalse(cache_is_current(path, data_dir, backend="nltk"))
+            self.assertEqual(list(iter_cached_sentences(path, backend="spacy")), [[("Hello", "UH")]])
+            with self.assertRaises(ValueError):
+                list(iter_cached_sentences(path, backend="nltk"))
+
+
+if __name__ == "__main__":
+    unittest.main()
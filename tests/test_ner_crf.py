@@ -0,0 +1,56 @@
+import unittest
+
+from models.ner_crf import CRFNER, sent_to_features, to_item_sequences, word2features
+
+
+class TestNerCrf(unittest.TestCase):
+    def test_sent_to_features_matches_word2features(self):
+        sent = [("Apple", "NNP"), ("is", "VBZ"), ("BIG", "JJ"), ("2025", "CD")]
+        expected = [word2features(sent, i) for i in range(len(sent))]
+        self.assertEqual(sent_to_features(sent), expected)
+
+    def test_sent_to_features_marks_sentence_boundaries(self):
+        features = sent_to_features([("Hello", "UH")])
+        self.assertEqual(len(features), 1)
+        self.assertTrue(features[0]["BOS"])
+        self.assertTrue(features[0]["EOS"])
+        self.assertNotIn("-1:token.lower()", features[0])
+        self.assertNotIn("+1:token.lower()", features[0])
+
+    def test_sent_to_features_empty_sentence(self):
+        self.assertEqual(sent_to_features([]), [])
+
+    def test_to_item_sequences_trains_the_same_model_as_dicts(self):
+        sents = [
+            [("Apple", "NNP"), ("is", "VBZ"), ("BIG", "JJ")],
+            [("Google", "NNP"), ("sold", "VBD"), ("2025", "CD"), ("phones", "NNS")],
+            [("IBM", "NNP"), ("is", "VBZ"), ("old", "JJ")],
+        ]
+        labels = [["B-ORG", "O", "O"], ["B-ORG", "O", "O", "O"], ["B-ORG", "O", "O"]]
+        X = [sent_to_features(s) for s in sents]
+
+        from_dicts = CRFNER()
+        from_dicts.model.fit(X, labels)
+        from_items = CRFNER()
+        from_items.model.fit(to_item_sequences(X), labels)
+
+        # learned only from the O tokens where istitle() is False
+        self.assertIn(("token.istitle()", "O"), from_dicts.model.state_features_)
+        self.assertEqual(from_items.model.state_features_, from_dicts.model.state_features_)
+        self.assertEqual(from_items.model.transition_features_, from_dicts.model.transition_features_)
+
+    def test_crfner_fit_and_predict_on_feature_dicts(self):
+        sents = [
+            [("Apple", "NNP"), ("is", "VBZ"), ("big", "JJ")],
+            [("Google", "NNP"), ("is", "VBZ"), ("small", "JJ")],
+        ]
+        labels = [["B-ORG", "O", "O"], ["B-ORG", "O", "O"]]
+        X = [sent_to_features(s) for s in sents]
+        model = CRFNER()
+        model.fit(X, labels)
+        self.assertEqual([list(p) for p in model.predict(X)], labels)
+        self.assertEqual([list(p) for p in model.predict(to_item_sequences(X))], labels)
+
+
+if __name__ == "__main__":
+    unittest.main()
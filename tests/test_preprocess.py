@@ -0,0 +1,37 @@
+import unittest
+from unittest import mock
+
+import spacy
+
+from scripts import preprocess as pp
+
+
+class TestPreprocess(unittest.TestCase):
+    def test_pipe_articles_with_spacy_keeps_order_and_drops_whitespace(self):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        articles = [{"text": "One two.\n\nThree."}, {"body": "Four."}]
+        with mock.patch.object(pp, "_get_nlp", return_value=nlp):
+            tagged = list(pp.pipe_articles(articles, n_process=1, backend="spacy"))
+
+        self.assertEqual(
+            [[[tok for tok, _ in sent] for sent in sents] for sents in tagged],
+            [[["One", "two", "."], ["Three", "."]], [["Four", "."]]],
+        )
+
+    def test_spacy_backend_does_not_fall_back_to_nltk(self):
+        pp._get_nlp.cache_clear()
+        try:
+            with mock.patch.object(pp, "spacy", None):
+                with self.assertRaises(ImportError):
+                    pp.article_to_sent_tokens_pos({"text": "One."}, backend="spacy")
+        finally:
+            pp._get_nlp.cache_clear()
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            pp.article_to_sent_tokens_pos({"text": "One."}, backend="stanza")
+
+
+if __name__ == "__main__":
+    unittest.main()
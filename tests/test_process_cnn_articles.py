@@ -0,0 +1,45 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from process_cnn_articles import process_directory, split_sentences_regex
+
+
+class TestProcessCnnArticles(unittest.TestCase):
+    def test_split_sentences_regex_normalizes_whitespace(self):
+        text = "  First sentence.\n\nSecond one!   \"Third?\" 4 more. "
+        self.assertEqual(
+            split_sentences_regex(text),
+            ["First sentence.", "Second one!", "\"Third?\" 4 more."],
+        )
+
+    def test_process_directory_writes_one_sentence_per_line(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_dir = Path(tmp_dir) / "articles"
+            input_dir.mkdir()
+            (input_dir / "a.json").write_text(
+                json.dumps({
+                    "url": "https://lite.cnn.com/a",
+                    "text": "Source: CNN\n\nDropped with the source line.\n\nFirst sentence.\n\nSecond sentence.\n\nSee Full Web Article",
+                }),
+                encoding="utf-8",
+            )
+            (input_dir / "b.jsonl").write_text(
+                '{"id": "b1", "text": "Line one. Line two."}\n\n{"id": "b2", "text": ""}\n',
+                encoding="utf-8",
+            )
+            output_file = Path(tmp_dir) / "out.txt"
+
+            process_directory(input_dir, output_file)
+
+            lines = output_file.read_text(encoding="utf-8").split("\n")
+            self.assertEqual(lines[-1], "")
+            self.assertEqual(
+                sorted(lines[:-1]),
+                ["First sentence.", "Line one.", "Line two.", "Second sentence."],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,23 @@
+import asyncio
+import os
 import tempfile
 import unittest
+from datetime import datetime, timezone
 from pathlib import Path
+from unittest import mock
 
+import httpx
+
+import scrape_cnn_lite
 from scrape_cnn_lite import (
-    extract_article_data,
+    fetch_and_parse_articles,
+    HASH_INDEX_FILENAME,
+    RateLimiter,
     get_article_hash,
+    get_article_links_from_homepage,
     load_existing_text_hashes,
+    parse_article_data,
+    save_article,
     split_author_text,
 )
 
@@ -13,16 +25,17 @@ from scrape_cnn_lite import (
 class FakeResponse:
     def __init__(self, text):
         self.text = text
+        self.content = text.encode("utf-8")
 
     def raise_for_status(self):
         pass
 
 
-class FakeSession:
+class FakeClient:
     def __init__(self, text):
         self._text = text
 
-    def get(self, url, timeout=30):
+    async def get(self, url, timeout=30):
         return FakeResponse(self._text)
 
 
@@ -39,7 +52,7 @@ class TestScrapeCnnLite(unittest.TestCase):
         authors = split_author_text("By Jane Doe, CNN and John Smith, CNN")
         self.assertEqual(authors, ["Jane Doe", "John Smith"])
 
-    def test_extract_article_data_uses_text_hash_and_authors(self):
+    def test_parse_article_data_uses_text_hash_and_authors(self):
         html = (
             "<html><body>"
             "<h1>Sample Title</h1>"
@@ -47,15 +60,14 @@ class TestScrapeCnnLite(unittest.TestCase):
             "<article><p>Paragraph one.</p><p>Paragraph two.</p></article>"
             "</body></html>"
         )
-        session = FakeSession(html)
-        article_data = extract_article_data("https://lite.cnn.com/sample", session)
+        article_data = parse_article_data("https://lite.cnn.com/sample", html.encode("utf-8"))
 
         expected_text = "Paragraph one.\n\nParagraph two."
         self.assertEqual(article_data["authors"], ["Jane Doe", "John Smith"])
         self.assertEqual(article_data["text"], expected_text)
         self.assertEqual(article_data["hash"], get_article_hash(expected_text))
 
-    def test_extract_article_data_omits_block_list_links(self):
+    def test_parse_article_data_omits_block_list_links(self):
         html = (
             "<html><body>"
             "<h1>Sample Title</h1>"
@@ -68,12 +80,11 @@ class TestScrapeCnnLite(unittest.TestCase):
             '<a href="https://www.cnn.com/world/story">Story</a>'
             "</body></html>"
         )
-        session = FakeSession(html)
-        article_data = extract_article_data("https://lite.cnn.com/sample", session)
+        article_data = parse_article_data("https://lite.cnn.com/sample", html.encode("utf-8"))
 
         self.assertEqual(article_data["links"], [{"url": "https://www.cnn.com/world/story", "text": "Story"}])
 
-    def test_extract_article_data_omits_same_route_links_across_cnn_domains(self):
+    def test_parse_article_data_omits_same_route_links_across_cnn_domains(self):
         html = (
             "<html><body>"
             "<h1>Sample Title</h1>"
@@ -83,11 +94,84 @@ class TestScrapeCnnLite(unittest.TestCase):
             '<a href="https://www.cnn.com/world/story">Story</a>'
             "</body></html>"
         )
-        session = FakeSession(html)
-        article_data = extract_article_data("https://lite.cnn.com/2026/02/24/tech/article-url", session)
+        article_data = parse_article_data("https://lite.cnn.com/2026/02/24/tech/article-url", html.encode("utf-8"))
 
         self.assertEqual(article_data["links"], [{"url": "https://www.cnn.com/world/story", "text": "Story"}])
 
+    def test_parse_article_data_reads_date_in_selector_priority(self):
+        html = (
+            "<html><body>"
+            '<div class="update-date">Updated yesterday</div>'
+            '<time datetime="2026-02-24T10:00:00Z">Feb 24</time>'
+            "<article><p>Paragraph one.</p></article>"
+            "</body></html>"
+        )
+        article_data = parse_article_data("https://lite.cnn.com/sample", html.encode("utf-8"))
+
+        self.assertEqual(article_data["date"], "2026-02-24T10:00:00Z")
+
+    def test_parse_article_data_falls_back_to_now_without_date_element(self):
+        html = '<html><body><p class="timestamp--lite">Updated</p><article><p>Paragraph one.</p></article></body></html>'
+        before = datetime.now(timezone.utc)
+        article_data = parse_article_data("https://lite.cnn.com/sample", html.encode("utf-8"))
+
+        self.assertGreaterEqual(datetime.fromisoformat(article_data["date"]), before)
+
+    def test_get_article_links_from_homepage_dedups_in_order(self):
+        html = (
+            "<html><body>"
+            '<a href="/2026/02/24/tech/article-url">One</a>'
+            '<a href="/world/story">Two</a>'
+            '<a href="https://lite.cnn.com/2026/02/24/tech/article-url">One again</a>'
+            '<a href="https://example.com/2026/elsewhere">Off site</a>'
+            '<a href="/about">About</a>'
+            "</body></html>"
+        )
+        links = asyncio.run(get_article_links_from_homepage("https://lite.cnn.com", FakeClient(html)))
+
+        self.assertEqual(
+            links,
+            ["https://lite.cnn.com/2026/02/24/tech/article-url", "https://lite.cnn.com/world/story"],
+        )
+
+    def test_get_article_links_from_homepage_reads_any_href_quoting(self):
+        html = (
+            "<html><body>"
+            "<A HREF='/world/one?a=1&amp;b=2'>One</A>"
+            '<a class="x"\n   href=/politics/two>Two</a>'
+            '<a data-href="/world/not-a-link">Skipped</a>'
+            "</body></html>"
+        )
+        links = asyncio.run(get_article_links_from_homepage("https://lite.cnn.com", FakeClient(html)))
+
+        self.assertEqual(
+            links,
+            ["https://lite.cnn.com/world/one?a=1&b=2", "https://lite.cnn.com/politics/two"],
+        )
+
+    def test_get_article_links_from_homepage_ignores_href_text_in_other_attributes(self):
+        html = '<html><body><a title="see href=/world/bogus" href="/politics/real">Real</a></body></html>'
+        links = asyncio.run(get_article_links_from_homepage("https://lite.cnn.com", FakeClient(html)))
+
+        self.assertEqual(links, ["https://lite.cnn.com/politics/real"])
+
+    def test_get_article_links_from_homepage_ignores_commented_out_anchors(self):
+        html = '<html><body><!-- <a href="/world/commented">Old</a> --><a href="/world/real">Real</a></body></html>'
+        links = asyncio.run(get_article_links_from_homepage("https://lite.cnn.com", FakeClient(html)))
+
+        self.assertEqual(links, ["https://lite.cnn.com/world/real"])
+
+    def test_get_article_links_from_homepage_ignores_anchors_in_scripts(self):
+        html = (
+            "<html><body>"
+            '<script>var s = \'<a href="/world/fake">x</a>\';</script>'
+            '<a href="/world/real">Real</a>'
+            "</body></html>"
+        )
+        links = asyncio.run(get_article_links_from_homepage("https://lite.cnn.com", FakeClient(html)))
+
+        self.assertEqual(links, ["https://lite.cnn.com/world/real"])
+
     def test_load_existing_text_hashes_prefers_stored_hash(self):
         with tempfile.TemporaryDirectory() as tmp_dir:
             output_dir = Path(tmp_dir)
@@ -106,6 +190,84 @@ class TestScrapeCnnLite(unittest.TestCase):
             self.assertIn("storedhash", hashes)
             self.assertIn(get_article_hash("legacy text"), hashes)
 
+    def test_load_existing_text_hashes_rehashes_legacy_sha256(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_dir = Path(tmp_dir)
+            sha256_hash = "a" * 64
+            (output_dir / f"{sha256_hash}.json").write_text(
+                f'{{"hash": "{sha256_hash}", "authors": [], "text": "old text"}}',
+                encoding="utf-8",
+            )
+
+            hashes = load_existing_text_hashes(output_dir)
+            self.assertEqual(hashes, {get_article_hash("old text")})
+            self.assertEqual(len(get_article_hash("old text")), 32)
+
+    def test_load_existing_text_hashes_uses_and_extends_hash_index(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_dir = Path(tmp_dir)
+            (output_dir / "stored.json").write_text(
+                '{"hash": "storedhash", "authors": [], "text": "ignored"}',
+                encoding="utf-8",
+            )
+
+            self.assertEqual(load_existing_text_hashes(output_dir), {"storedhash"})
+            index_path = output_dir / HASH_INDEX_FILENAME
+            self.assertEqual(index_path.read_text(encoding="utf-8"), "storedhash\n")
+
+            save_article({"hash": "newhash", "title": "New title"}, output_dir)
+            self.assertEqual(load_existing_text_hashes(output_dir), {"storedhash", "newhash"})
+
+    def test_load_existing_text_hashes_rebuilds_stale_index(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_dir = Path(tmp_dir)
+            index_path = output_dir / HASH_INDEX_FILENAME
+            index_path.write_text("outdated\n", encoding="utf-8")
+            os.utime(index_path, (0, 0))
+            (output_dir / "stored.json").write_text(
+                '{"hash": "storedhash", "authors": [], "text": "ignored"}',
+                encoding="utf-8",
+            )
+
+            self.assertEqual(load_existing_text_hashes(output_dir), {"storedhash"})
+            self.assertEqual(index_path.read_text(encoding="utf-8"), "storedhash\n")
+
+    def test_fetch_and_parse_articles_keeps_order_and_skips_failures(self):
+        html = b"<html><body><h1>Sample Title</h1><article><p>Paragraph one.</p></article></body></html>"
+
+        def handler(request):
+            if request.url.path == "/missing":
+                return httpx.Response(404)
+            return httpx.Response(200, content=html)
+
+        async def fetch(urls):
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await fetch_and_parse_articles(urls, client)
+
+        urls = ["https://lite.cnn.com/one", "https://lite.cnn.com/missing", "https://lite.cnn.com/two"]
+        with mock.patch.object(scrape_cnn_lite, "SLEEP_TIME", 0):
+            articles = asyncio.run(fetch(urls))
+
+        self.assertEqual([a and a["url"] for a in articles], [urls[0], None, urls[2]])
+        self.assertEqual(articles[0]["text"], "Paragraph one.")
+
+    def test_rate_limiter_spaces_every_start_by_the_interval(self):
+        async def start_times():
+            limiter = RateLimiter(0.05)
+            loop = asyncio.get_running_loop()
+            began = loop.time()
+
+            async def start():
+                await limiter.acquire()
+                return loop.time() - began
+
+            return await asyncio.gather(*[start() for _ in range(4)])
+
+        times = asyncio.run(start_times())
+        self.assertLess(times[0], 0.04)
+        for earlier, later in zip(times, times[1:]):
+            self.assertGreaterEqual(later - earlier, 0.045)
+
 
 if __name__ == "__main__":
     unittest.main()